@@ -5,8 +5,17 @@ Manages the game loop where multiple LLM models take turns in a conversation,
 trying to figure out which model they are.
 """
 
+import argparse
+import asyncio
+import io
 import json
 import random
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from openai import DefaultAsyncHttpxClient
 
 from models import (
     Player,
@@ -14,35 +23,97 @@ from models import (
     GAME_TOOLS,
     PROVIDER_MODELS,
 )
-from provider import create_provider
+from provider import ResponseCache, create_provider
+from source_blob import SOURCE_BLOB
 from gcp_secrets import SecretsContainer
 
+# First run of digits in a tool's "target_player" argument ("Player 3" -> 3)
+PLAYER_ID_RE = re.compile(r"\d+")
+
+
+class _TokenRelay:
+    """Collects streamed tokens until a consumer attaches, then forwards them live."""
+
+    def __init__(self):
+        self._buffer: list[str] = []
+        self._forward = None
+
+    def __call__(self, token: str):
+        if self._forward is not None:
+            self._forward(token)
+        else:
+            self._buffer.append(token)
+
+    def attach(self, forward):
+        """Replay everything received so far to `forward`, then pass new tokens straight through."""
+        if self._buffer:
+            forward("".join(self._buffer))
+            self._buffer.clear()
+        self._forward = forward
+
 
 class StillePostGame:
     """Main game engine for Stille Post."""
 
+    # Tool name -> handler method; every handler takes (player, args)
+    _TOOL_DISPATCH = {
+        "russian_roulette": "_tool_russian_roulette",
+        "guess_model": "_tool_guess_model",
+        "proclaim_superiority": "_tool_proclaim",
+        "propose_task": "_tool_propose_task",
+    }
+
     def __init__(
         self,
         num_players: int = 5,
         rounds_between_guesses: int = 3,
         max_rounds: int = 15,
+        cache_path: str | None = None,
+        seed: int | None = None,
+        use_batch_api: bool = False,
+        batch_timeout: float = 120,
+        interactive: bool = True,
     ):
+        # Interactive games pause for the observer after each message
+        self.interactive = interactive
+        self._prefetch: tuple[int, list[dict], asyncio.Task, _TokenRelay] | None = None
+        # Identity guesses can go through the (half-price, slower) Batch API
+        self.use_batch_api = use_batch_api
+        self.batch_timeout = batch_timeout
+        # One seeded RNG for every game decision, so a seed replays the same game
+        self.rng = random.Random(seed)
         self.secrets = SecretsContainer()
+        self.response_cache = ResponseCache(path=cache_path)
+        # One keep-alive pool for all async calls instead of one per provider
+        self.http_client = DefaultAsyncHttpxClient()
         self.providers = self._init_providers()
         self.game_state = self._init_game(num_players, rounds_between_guesses, max_rounds)
+        self._model_ids_lower = {p.player_id: p.model_id.lower() for p in self.game_state.players}
         self.system_prompt = self._load_system_prompt()
+        # Prompt and sources never change during a game — build the prefix once
+        self._system_prefix = f"{self.system_prompt}\n{SOURCE_BLOB}"
 
     # ── Setup ───────────────────────────────────────────────────────
 
     def _init_providers(self) -> dict:
         """Create one provider instance per backend."""
-        keys = {
-            "openai": self.secrets.OPENAI_API_KEY,
-            "anthropic": self.secrets.ANTHROPIC_API_KEY,
-            "google": self.secrets.GOOGLE_API_KEY,
+        secret_names = {
+            "openai": "OPENAI_API_KEY",
+            "anthropic": "ANTHROPIC_API_KEY",
+            "google": "GOOGLE_API_KEY",
         }
+        # Fetch all keys at once — each cache miss is a separate GCP round-trip
+        with ThreadPoolExecutor(max_workers=len(secret_names)) as pool:
+            values = pool.map(lambda secret: getattr(self.secrets, secret), secret_names.values())
+            keys = dict(zip(secret_names, values))
         return {
-            name: create_provider(name, api_key, PROVIDER_MODELS[name])
+            name: create_provider(
+                name,
+                api_key,
+                PROVIDER_MODELS[name],
+                cache=self.response_cache,
+                http_client=self.http_client,
+            )
             for name, api_key in keys.items()
         }
 
@@ -53,7 +124,7 @@ class StillePostGame:
             for provider, models in PROVIDER_MODELS.items()
             for model in models
         ]
-        selected = random.sample(all_models, min(num_players, len(all_models)))
+        selected = self.rng.sample(all_models, min(num_players, len(all_models)))
 
         players = [
             Player(player_id=i + 1, provider_name=prov, model_id=model)
@@ -74,66 +145,60 @@ class StillePostGame:
         prompt = prompt.replace("{num_players}", str(len(self.game_state.players)))
         return prompt
 
-    def _load_source_code(self) -> str:
-        """Load all game source files for full transparency."""
-        source_files = ["game.py", "models.py", "provider.py"]
-        parts = ["\n## Full Source Code"]
-        for filename in source_files:
-            try:
-                with open(filename, "r", encoding="utf-8") as f:
-                    code = f.read()
-                parts.append(f"\n### {filename}\n```python\n{code}\n```")
-            except FileNotFoundError:
-                parts.append(f"\n### {filename}\n(file not found)")
-        return "\n".join(parts)
-
     # ── Per-Player Prompt ───────────────────────────────────────────
 
-    def _player_system_prompt(self, player: Player) -> str:
-        """Build personalised system prompt with private hints and full source code."""
-        parts = [
-            self.system_prompt,
-            self._load_source_code(),
-            f"\n## Your Identity",
-            f"You are **Player {player.player_id}**.",
-            f"There are currently **{len(self.game_state.active_players)}** active players.",
+    def _player_system_messages(self, player: Player) -> list[dict]:
+        """
+        System messages for a player: the shared prefix first, then the private part.
+
+        The first message is byte-identical for every player and turn, so providers
+        can serve it from their prompt cache. Anything per-player or per-turn must
+        go into the second message.
+        """
+        return [
+            {"role": "system", "content": self._system_prefix},
+            {"role": "system", "content": self._player_identity_prompt(player)},
         ]
 
+    def _player_identity_prompt(self, player: Player) -> str:
+        """Build the per-player identity section with private hints."""
+        hints_block = ""
         if player.private_hints:
-            parts.append("\n## 🔒 YOUR PRIVATE HINTS (Do not share!)")
-            parts.extend(f">>> [SYSTEM HINT]: {h} <<<" for h in player.private_hints)
-
-        return "\n".join(parts)
+            hint_lines = "\n".join(f">>> [SYSTEM HINT]: {h} <<<" for h in player.private_hints)
+            hints_block = f"\n\n## 🔒 YOUR PRIVATE HINTS (Do not share!)\n{hint_lines}"
+
+        return (
+            f"## Your Identity\n"
+            f"You are **Player {player.player_id}**.\n"
+            f"There are currently **{len(self.game_state.active_players)}** active players."
+            f"{hints_block}"
+        )
 
     # ── Tool Execution ──────────────────────────────────────────────
 
-    def _execute_tool(self, player: Player, tool_call: dict) -> str:
-        """Route a tool call to its handler and return the result string."""
-        name = tool_call["name"]
+    @staticmethod
+    def _parse_tool_args(tool_call: dict) -> dict:
+        """Decode a tool call's arguments (a JSON string from the API) exactly once."""
         raw_args = tool_call["arguments"]
-        args = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
+        return json.loads(raw_args) if isinstance(raw_args, str) else raw_args
 
-        handlers = {
-            "russian_roulette": lambda: self._tool_russian_roulette(player),
-            "guess_model": lambda: self._tool_guess_model(player, args),
-            "proclaim_superiority": lambda: self._tool_proclaim(player, args),
-            "propose_task": lambda: self._tool_propose_task(player, args),
-        }
-        handler = handlers.get(name)
-        if not handler:
+    def _execute_tool(self, player: Player, name: str, args: dict) -> str:
+        """Route a tool call to its handler and return the result string."""
+        method_name = self._TOOL_DISPATCH.get(name)
+        if method_name is None:
             return f"❓ Unknown tool: {name}"
-        return handler()
+        return getattr(self, method_name)(player, args)
 
-    def _tool_russian_roulette(self, player: Player) -> str:
-        if random.random() < 0.5:
-            player.is_active = False
+    def _tool_russian_roulette(self, player: Player, args: dict) -> str:
+        if self.rng.random() < 0.5:
+            self.game_state.eliminate(player)
             return f"💀 BANG! Player {player.player_id} shot themselves and is eliminated!"
 
-        others = [p for p in self.game_state.active_players if p.player_id != player.player_id]
+        others = [p for p in self.game_state.active_players if p is not player]
         if not others:
             return f"🎯 Player {player.player_id} survived! No one else to hit though."
-        victim = random.choice(others)
-        victim.is_active = False
+        victim = self.rng.choice(others)
+        self.game_state.eliminate(victim)
         return f"🎯 Player {player.player_id} survived! Player {victim.player_id} was eliminated!"
 
     def _tool_guess_model(self, player: Player, args: dict) -> str:
@@ -141,28 +206,28 @@ class StillePostGame:
         guessed_model = args.get("guessed_model", "").strip().lower()
 
         # Parse player ID from string (might be "Player 3" or just "3")
-        target_id = int("".join(c for c in target_str if c.isdigit()) or "0")
-        target = next((p for p in self.game_state.players if p.player_id == target_id), None)
+        match = PLAYER_ID_RE.search(target_str)
+        target_id = int(match.group()) if match else 0
+        target = self.game_state.players_by_id.get(target_id)
         if not target:
             return f"❌ Player {target_str} not found."
 
-        if target.model_id.lower() in guessed_model or guessed_model in target.model_id.lower():
+        if self._matches_model(target, guessed_model):
             hint = self._generate_hint(player)
             player.private_hints.append(hint)
             return f"✅ Correct! Player {target_id} is indeed that model. You earned a private hint!"
         return f"❌ Wrong guess about Player {target_id}."
 
+    def _matches_model(self, player: Player, guess: str) -> bool:
+        """Lenient match of a lowercased guess against the player's model ID."""
+        actual = self._model_ids_lower[player.player_id]
+        return actual in guess or guess in actual
+
     def _generate_hint(self, player: Player) -> str:
-        """Generate a progressive hint about the player's own identity."""
-        possible_hints = [
-            f"Your provider is '{player.provider_name}'.",
-            f"Your model name has {len(player.model_id)} characters.",
-            f"The first letter of your model ID is '{player.model_id[0]}'.",
-            f"You are {'a flagship/large' if any(k in player.model_id.lower() for k in ['pro', 'opus', '5.2']) else 'a smaller/efficient'} model.",
-            f"Your model ID contains the substring '{player.model_id[len(player.model_id)//3 : 2*len(player.model_id)//3]}'.",
-        ]
-        unseen = [h for h in possible_hints if h not in player.private_hints]
-        return random.choice(unseen) if unseen else "No more hints available — you've seen them all!"
+        """Pick a not-yet-seen hint about the player's own identity."""
+        seen = set(player.private_hints)
+        unseen = [h for h in player.hint_pool if h not in seen]
+        return self.rng.choice(unseen) if unseen else "No more hints available — you've seen them all!"
 
     def _tool_proclaim(self, player: Player, args: dict) -> str:
         proclamation = args.get("proclamation", "I am the best!")
@@ -174,9 +239,11 @@ class StillePostGame:
 
     # ── Identity Guess Round ────────────────────────────────────────
 
-    def _identity_guess_round(self):
+    async def _identity_guess_round(self):
         """Every N turns, each active player guesses their own identity."""
-        print(f"\n{'🎭 IDENTITY GUESS ROUND ':═^60}")
+        out = io.StringIO()
+        print(f"\n{'🎭 IDENTITY GUESS ROUND ':═^60}", file=out)
+        self._flush(out)
 
         all_model_names = [m for models in PROVIDER_MODELS.values() for m in models]
         guess_prompt = (
@@ -187,43 +254,93 @@ class StillePostGame:
             "Just the ID."
         )
 
-        for player in list(self.game_state.active_players):
-            provider = self.providers[player.provider_name]
-            messages = [
-                {"role": "system", "content": self._player_system_prompt(player)},
+        # All guesses are independent, so fire them concurrently
+        # Snapshot once: mark_won() shrinks the live list during the loop below
+        active = self.game_state.active_players[:]
+        requests = [
+            (player, [
+                *self._player_system_messages(player),
                 *self.game_state.conversation,
                 {"role": "user", "content": guess_prompt},
-            ]
+            ])
+            for player in active
+        ]
+        if self.use_batch_api:
+            results = await self._batch_generate(requests, out)
+        else:
+            results = await asyncio.gather(
+                *(
+                    self.providers[player.provider_name].agenerate(messages=messages, model=player.model_id)
+                    for player, messages in requests
+                ),
+                return_exceptions=True,
+            )
 
+        for player, result in zip(active, results):
             # Debug: show what hints the player ACTUALLY has
             if player.private_hints:
-                print(f"  [DEBUG] Player {player.player_id} has hints: {player.private_hints}")
+                print(f"  [DEBUG] Player {player.player_id} has hints: {player.private_hints}", file=out)
             else:
-                print(f"  [DEBUG] Player {player.player_id} has NO hints.")
+                print(f"  [DEBUG] Player {player.player_id} has NO hints.", file=out)
 
-            try:
-                result = provider.generate(messages=messages, model=player.model_id)
-                guess = result["content"].strip().lower()
-                actual = player.model_id.lower()
+            if isinstance(result, Exception):
+                print(f"  ⚠️  Player {player.player_id} error: {result}", file=out)
+                self._flush(out)
+                continue
 
-                print(f"\n  Player {player.player_id} guesses: '{guess}'")
-                print(f"  Actual model: '{actual}'")
+            guess = result["content"].strip().lower()
 
-                if actual in guess or guess in actual:
-                    print(f"  🏆 CORRECT! Player {player.player_id} wins!")
-                    player.has_won = True
-                else:
-                    print(f"  ❌ Wrong! Player {player.player_id} continues.")
-                input("\n  ⏎ Press Enter to continue...")
+            print(f"\n  Player {player.player_id} guesses: '{guess}'", file=out)
+            print(f"  Actual model: '{self._model_ids_lower[player.player_id]}'", file=out)
 
-            except Exception as e:
-                print(f"  ⚠️  Player {player.player_id} error: {e}")
+            if self._matches_model(player, guess):
+                print(f"  🏆 CORRECT! Player {player.player_id} wins!", file=out)
+                self.game_state.mark_won(player)
+            else:
+                print(f"  ❌ Wrong! Player {player.player_id} continues.", file=out)
+            self._flush(out)
+            await self._pause()
+
+    async def _batch_generate(self, requests: list[tuple[Player, list[dict]]], out: io.StringIO) -> list:
+        """
+        Submit one Batch API job per provider, falling back to direct calls
+        for providers without batch support or whose batch fails or times out.
+        Results (or exceptions) are returned in request order; fallback
+        warnings go into the round's `out` buffer.
+        """
+        by_provider: dict[str, list[int]] = {}
+        for i, (player, _) in enumerate(requests):
+            by_provider.setdefault(player.provider_name, []).append(i)
+
+        results: list = [None] * len(requests)
+
+        async def run_group(provider_name: str, indices: list[int]):
+            provider = self.providers[provider_name]
+            jobs = [(requests[i][1], requests[i][0].model_id) for i in indices]
+            group_results = None
+            if provider.config.supports_batch:
+                try:
+                    group_results = await provider.abatch_generate(jobs, timeout=self.batch_timeout)
+                except Exception as e:
+                    print(f"  ⚠️  {provider_name} batch failed ({e}), falling back to direct calls.", file=out)
+            if group_results is None:
+                group_results = await asyncio.gather(
+                    *(provider.agenerate(messages=messages, model=model) for messages, model in jobs),
+                    return_exceptions=True,
+                )
+            for i, result in zip(indices, group_results):
+                results[i] = result
+
+        await asyncio.gather(*(run_group(name, indices) for name, indices in by_provider.items()))
+        return results
 
     # ── Introduction Round ──────────────────────────────────────────
 
-    def _introduction_round(self):
+    async def _introduction_round(self):
         """Each player writes an opening message before the game begins."""
-        print(f"\n{'🎬 INTRODUCTION ROUND ':═^60}")
+        out = io.StringIO()
+        print(f"\n{'🎬 INTRODUCTION ROUND ':═^60}", file=out)
+        self._flush(out)
 
         intro_prompt = (
             "The game is about to begin! This is the INTRODUCTION ROUND.\n\n"
@@ -235,16 +352,18 @@ class StillePostGame:
             "You can also use a tool if you wish. Be strategic!"
         )
 
+        # Sequential on purpose: each opener (and any tool result) is part of the
+        # conversation the next player sees, so these calls can't be gathered.
         for player in self.game_state.players:
             provider = self.providers[player.provider_name]
             messages = [
-                {"role": "system", "content": self._player_system_prompt(player)},
+                *self._player_system_messages(player),
                 *self.game_state.conversation,
                 {"role": "user", "content": intro_prompt},
             ]
 
             try:
-                result = provider.generate(
+                result = await provider.agenerate(
                     messages=messages,
                     model=player.model_id,
                     tools=GAME_TOOLS,
@@ -256,27 +375,28 @@ class StillePostGame:
                     "content": f"[Player {player.player_id}]: {content}",
                 })
 
-                print(f"\n{'─'*55}")
-                print(f"  🎤 Player {player.player_id}  ({player.provider_name} model / ???)")
-                print(f"{'─'*55}")
-                print(content)
+                print(f"\n{'─'*55}", file=out)
+                print(f"  🎤 Player {player.player_id}  ({player.provider_name} model / ???)", file=out)
+                print(f"{'─'*55}", file=out)
+                print(content, file=out)
 
                 # Handle tool calls during intro
                 for tc in result.get("tool_calls", []):
-                    raw_args = tc['arguments']
-                    args_str = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
-                    print(f"\n  🔧 [{tc['name']}] args: {args_str}")
-                    tool_result = self._execute_tool(player, tc)
-                    print(f"\n  🔧 [{tc['name']}] → {tool_result}")
+                    args = self._parse_tool_args(tc)
+                    print(f"\n  🔧 [{tc['name']}] args: {args}", file=out)
+                    tool_result = self._execute_tool(player, tc["name"], args)
+                    print(f"\n  🔧 [{tc['name']}] → {tool_result}", file=out)
                     self.game_state.conversation.append({
                         "role": "user",
                         "content": f"[GAME MASTER]: {tool_result}",
                     })
 
-                input("\n  ⏎ Press Enter to continue...")
+                self._flush(out)
+                await self._pause()
 
             except Exception as e:
-                print(f"\n  ⚠️  Player {player.player_id} intro error: {e}")
+                print(f"\n  ⚠️  Player {player.player_id} intro error: {e}", file=out)
+                self._flush(out)
                 self.game_state.conversation.append({
                     "role": "user",
                     "content": f"[GAME MASTER]: Player {player.player_id} had a technical difficulty during intro.",
@@ -284,21 +404,37 @@ class StillePostGame:
 
     # ── Single Turn ─────────────────────────────────────────────────
 
-    def _play_turn(self, player: Player):
-        """Execute one turn for a player."""
+    async def _play_turn(self, player: Player):
+        """Execute one turn for a player, streaming their message as it is generated."""
         provider = self.providers[player.provider_name]
+        messages = self._turn_messages(player)
+        prefetched = self._take_prefetch(player, messages)
 
-        messages = [
-            {"role": "system", "content": self._player_system_prompt(player)},
-            *self.game_state.conversation,
-        ]
+        out = io.StringIO()
+        print(f"\n{'═'*55}", file=out)
+        print(f"  TURN {self.game_state.current_turn} / {self.game_state.max_rounds}", file=out)
+        print(f"{'═'*55}", file=out)
+        print(f"\n{'─'*55}", file=out)
+        print(f"  🎤 Player {player.player_id}  ({player.provider_name} model / ???)", file=out)
+        print(f"{'─'*55}", file=out)
+
+        def print_token(tok: str):
+            print(tok, end="", flush=True)
 
         try:
-            result = provider.generate(
-                messages=messages,
-                model=player.model_id,
-                tools=GAME_TOOLS,
-            )
+            self._flush(out)  # header first, then the streamed tokens go straight out
+            if prefetched is not None:
+                task, relay = prefetched
+                relay.attach(print_token)  # tokens that arrived during the pause, then the rest live
+                result = await task
+            else:
+                result = await provider.agenerate_stream(
+                    messages=messages,
+                    model=player.model_id,
+                    tools=GAME_TOOLS,
+                    on_token=print_token,
+                )
+            print(file=out)
 
             content = result["content"]
             self.game_state.conversation.append({
@@ -306,62 +442,177 @@ class StillePostGame:
                 "content": f"[Player {player.player_id}]: {content}",
             })
 
-            print(f"\n{'─'*55}")
-            print(f"  🎤 Player {player.player_id}  ({player.provider_name} model / ???)")
-            print(f"{'─'*55}")
-            print(content)
-
             # Handle tool calls
             for tc in result.get("tool_calls", []):
-                raw_args = tc['arguments']
-                args_str = json.loads(raw_args) if isinstance(raw_args, str) else raw_args
-                print(f"\n  🔧 [{tc['name']}] args: {args_str}")
-                tool_result = self._execute_tool(player, tc)
-                print(f"     → {tool_result}")
+                args = self._parse_tool_args(tc)
+                print(f"\n  🔧 [{tc['name']}] args: {args}", file=out)
+                tool_result = self._execute_tool(player, tc["name"], args)
+                print(f"     → {tool_result}", file=out)
                 self.game_state.conversation.append({
                     "role": "user",
                     "content": f"[GAME MASTER]: {tool_result}",
                 })
 
-            input("\n  ⏎ Press Enter to continue...")
+            self._flush(out)
+
+            # Overlap the next player's request with the observer's reading time
+            self._prefetch_next_turn(player)
+            await self._pause()
 
         except Exception as e:
-            print(f"\n  ⚠️  Player {player.player_id} error: {e}")
+            print(f"\n  ⚠️  Player {player.player_id} error: {e}", file=out)
+            self._flush(out)
             self.game_state.conversation.append({
                 "role": "user",
                 "content": f"[GAME MASTER]: Player {player.player_id} had a technical difficulty. Skipping.",
             })
 
+    @staticmethod
+    def _flush(out: io.StringIO):
+        """Write buffered output to the terminal in one go and reset the buffer."""
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+        out.seek(0)
+        out.truncate()
+
+    def _turn_messages(self, player: Player) -> list[dict]:
+        return [
+            *self._player_system_messages(player),
+            *self.game_state.conversation,
+        ]
+
+    async def _pause(self):
+        """
+        Wait for the observer to press Enter.
+
+        stdin is read on a daemon thread so the event loop keeps running any
+        prefetch. A blocking input() on the loop would also need two Ctrl+C
+        presses, because asyncio.run's SIGINT handler only cancels the main
+        task. A daemon thread never blocks interpreter exit.
+        """
+        if not self.interactive:
+            return
+
+        loop = asyncio.get_running_loop()
+        answer = loop.create_future()
+
+        def settle(set_outcome, value):
+            if not answer.done():
+                set_outcome(value)
+
+        def read_line():
+            try:
+                line = input("\n  ⏎ Press Enter to continue...")
+            except BaseException as e:  # EOFError on closed stdin, etc.
+                loop.call_soon_threadsafe(settle, answer.set_exception, e)
+            else:
+                loop.call_soon_threadsafe(settle, answer.set_result, line)
+
+        threading.Thread(target=read_line, daemon=True).start()
+        try:
+            await answer
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            self._discard_prefetch()
+            raise
+
+    # ── Turn Prefetching ────────────────────────────────────────────
+
+    def _next_player(self, player: Player) -> Player | None:
+        """The player who speaks after `player`, in the same order the main loop uses."""
+        if len(self.game_state.active_players) <= 1:
+            return None
+        players = self.game_state.players
+        start = players.index(player)
+        for candidate in players[start + 1:] + players[:start + 1]:
+            if candidate.is_active and not candidate.has_won:
+                return candidate
+        return None
+
+    def _prefetch_next_turn(self, player: Player):
+        """Start the next player's request now, so it runs while the observer reads."""
+        if not self.interactive:
+            return
+        turn = self.game_state.current_turn
+        # A guess round (which may change the active players) or the end of the game comes next
+        if turn >= self.game_state.max_rounds or turn % self.game_state.rounds_between_guesses == 0:
+            return
+        next_player = self._next_player(player)
+        if next_player is None:
+            return
+
+        self._discard_prefetch()
+        messages = self._turn_messages(next_player)
+        relay = _TokenRelay()
+        task = asyncio.create_task(
+            self.providers[next_player.provider_name].agenerate_stream(
+                messages=messages,
+                model=next_player.model_id,
+                tools=GAME_TOOLS,
+                on_token=relay,
+            )
+        )
+        self._prefetch = (next_player.player_id, messages, task, relay)
+
+    def _take_prefetch(
+        self, player: Player, messages: list[dict]
+    ) -> tuple[asyncio.Task, _TokenRelay] | None:
+        """Hand out the prefetched stream if it was made for exactly this turn."""
+        if self._prefetch is None:
+            return None
+        player_id, prefetched_messages, task, relay = self._prefetch
+        if player_id == player.player_id and prefetched_messages == messages:
+            self._prefetch = None
+            return task, relay
+        self._discard_prefetch()
+        return None
+
+    def _discard_prefetch(self):
+        if self._prefetch is None:
+            return
+        _, _, task, _ = self._prefetch
+        self._prefetch = None
+        if task.done():
+            if not task.cancelled():
+                task.exception()  # mark as retrieved; the result is simply unused
+        else:
+            task.cancel()
+
     # ── Main Game Loop ──────────────────────────────────────────────
 
     def run(self):
         """Run the full game."""
+        asyncio.run(self._run_async())
+
+    async def _run_async(self):
+        try:
+            await self._play_game()
+        finally:
+            await self.http_client.aclose()
+
+    async def _play_game(self):
         self._print_banner()
 
         # Introduction round — each player writes their opening message
-        self._introduction_round()
+        await self._introduction_round()
 
         turn = 0
         while turn < self.game_state.max_rounds:
-            active = self.game_state.active_players
-            if len(active) <= 1:
+            # One copy per round; eliminations mid-round are caught by the check below
+            snapshot = self.game_state.active_players[:]
+            if len(snapshot) <= 1:
                 break
 
-            for player in list(active):
+            for player in snapshot:
                 if not player.is_active or player.has_won:
                     continue
 
                 turn += 1
                 self.game_state.current_turn = turn
-                print(f"\n{'═'*55}")
-                print(f"  TURN {turn} / {self.game_state.max_rounds}")
-                print(f"{'═'*55}")
-
-                self._play_turn(player)
+                await self._play_turn(player)
 
                 # Identity guess round every N turns
                 if turn % self.game_state.rounds_between_guesses == 0:
-                    self._identity_guess_round()
+                    await self._identity_guess_round()
 
                 if len(self.game_state.active_players) <= 1:
                     break
@@ -369,53 +620,67 @@ class StillePostGame:
                 if turn >= self.game_state.max_rounds:
                     break
 
+        self._discard_prefetch()
         self._print_results()
 
     # ── Display ─────────────────────────────────────────────────────
 
     def _print_banner(self):
-        print("╔══════════════════════════════════════════════════════╗")
-        print("║           🎮  STILLE POST — LLM Edition             ║")
-        print("╚══════════════════════════════════════════════════════╝")
-        print(f"  Players:       {len(self.game_state.players)}")
-        print(f"  Guess every:   {self.game_state.rounds_between_guesses} turns")
-        print(f"  Max rounds:    {self.game_state.max_rounds}")
-        print()
-        print("  🔐 SECRET ASSIGNMENTS (for the observer only):")
+        out = io.StringIO()
+        print("╔══════════════════════════════════════════════════════╗", file=out)
+        print("║           🎮  STILLE POST — LLM Edition             ║", file=out)
+        print("╚══════════════════════════════════════════════════════╝", file=out)
+        print(f"  Players:       {len(self.game_state.players)}", file=out)
+        print(f"  Guess every:   {self.game_state.rounds_between_guesses} turns", file=out)
+        print(f"  Max rounds:    {self.game_state.max_rounds}", file=out)
+        print(file=out)
+        print("  🔐 SECRET ASSIGNMENTS (for the observer only):", file=out)
         for p in self.game_state.players:
-            print(f"     Player {p.player_id}: {p.provider_name:>10} / {p.model_id}")
-        print()
+            print(f"     Player {p.player_id}: {p.provider_name:>10} / {p.model_id}", file=out)
+        print(file=out)
+        self._flush(out)
 
     def _print_results(self):
         winners = [p for p in self.game_state.players if p.has_won]
         eliminated = [p for p in self.game_state.players if not p.is_active]
         remaining = [p for p in self.game_state.players if p.is_active and not p.has_won]
+        out = io.StringIO()
 
-        print(f"\n{'═'*55}")
-        print("  🏁  GAME OVER")
-        print(f"{'═'*55}")
+        print(f"\n{'═'*55}", file=out)
+        print("  🏁  GAME OVER", file=out)
+        print(f"{'═'*55}", file=out)
 
         if winners:
-            print("\n  🏆 Winners (guessed themselves correctly):")
+            print("\n  🏆 Winners (guessed themselves correctly):", file=out)
             for p in winners:
-                print(f"     Player {p.player_id}: {p.model_id}")
+                print(f"     Player {p.player_id}: {p.model_id}", file=out)
         if eliminated:
-            print("\n  💀 Eliminated (russian roulette):")
+            print("\n  💀 Eliminated (russian roulette):", file=out)
             for p in eliminated:
-                print(f"     Player {p.player_id}: {p.model_id}")
+                print(f"     Player {p.player_id}: {p.model_id}", file=out)
         if remaining:
-            print("\n  🤷 Never figured it out:")
+            print("\n  🤷 Never figured it out:", file=out)
             for p in remaining:
-                print(f"     Player {p.player_id}: {p.model_id}")
-        print()
+                print(f"     Player {p.player_id}: {p.model_id}", file=out)
+        print(file=out)
+        self._flush(out)
 
 
 # ── Entry Point ─────────────────────────────────────────────────────
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stille Post — LLM telephone game")
+    parser.add_argument("--auto", action="store_true", help="run without 'Press Enter' pauses")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible game")
+    parser.add_argument("--cache-path", default=None, help="JSONL file to persist LLM responses across runs")
+    cli = parser.parse_args()
+
     game = StillePostGame(
         num_players=5,
         rounds_between_guesses=3,
         max_rounds=15,
+        cache_path=cli.cache_path,
+        seed=cli.seed,
+        interactive=not cli.auto,
     )
     game.run()
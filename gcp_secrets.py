@@ -1,21 +1,50 @@
+import json
+import os
+import threading
+import time
+
 from google.cloud import secretmanager
 
 
+# Decrypted secrets are mirrored here so dev-loop restarts skip the GCP round-trip
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "stillepost", "secrets.json")
+CACHE_TTL_SECONDS = 60 * 60
+
+
 class SecretsContainer:
     def __init__(self):
         self.project_id = "gen-lang-client-0320316404"
-        self.client = secretmanager.SecretManagerServiceClient()
+        self._client = None
+        self._lock = threading.Lock()
         self._cache = {}
+        self._disk_cache = self._load_disk_cache()
+
+    @property
+    def client(self) -> secretmanager.SecretManagerServiceClient:
+        # Created on first use: a warm disk cache never needs GCP credentials
+        with self._lock:
+            if self._client is None:
+                self._client = secretmanager.SecretManagerServiceClient()
+            return self._client
 
     def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
         if name in self._cache:
             return self._cache[name]
 
+        entry = self._disk_cache.get(name)
+        if entry and time.time() - entry["fetched_at"] < CACHE_TTL_SECONDS:
+            self._cache[name] = entry["value"]
+            return entry["value"]
+
         try:
             resource_name = f"projects/{self.project_id}/secrets/{name}/versions/latest"
             response = self.client.access_secret_version(request={"name": resource_name})
             payload = response.payload.data.decode("UTF-8")
             self._cache[name] = payload
+            self._store_disk_cache(name, payload)
             return payload
         except Exception as e:
             raise AttributeError(f"Secret '{name}' not found or inaccessible in project {self.project_id}.") from e
@@ -28,5 +57,26 @@ class SecretsContainer:
         for secret in self.client.list_secrets(request={"parent": parent}):
             print(f"Found secret: {secret.name}, {secret.create_time} ")
 
+    # ── Disk Cache ──────────────────────────────────────────────────
 
+    def _load_disk_cache(self) -> dict:
+        try:
+            with open(CACHE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get(self.project_id, {})
 
+    def _store_disk_cache(self, name: str, value: str):
+        """Write the cache atomically (tmp file + rename), readable by the owner only."""
+        with self._lock:
+            self._disk_cache[name] = {"value": value, "fetched_at": time.time()}
+            try:
+                os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+                tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({self.project_id: self._disk_cache}, f)
+                os.replace(tmp_path, CACHE_PATH)
+            except OSError:
+                pass  # the cache is an optimisation only
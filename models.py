@@ -22,6 +22,7 @@ class ProviderConfig:
     base_url: str            # Provider's OpenAI-compatible endpoint
     api_key: str             # Provider's API key
     models: list[str]        # Available model identifiers
+    supports_batch: bool = False  # Offers the OpenAI-style Batch API (files + batches)
 
 
 # ── Provider Endpoints ──────────────────────────────────────────────
@@ -32,6 +33,10 @@ PROVIDER_ENDPOINTS = {
     "google": "https://generativelanguage.googleapis.com/v1beta/openai/",
 }
 
+# Providers whose OpenAI-compatible endpoint also implements the Batch API
+# (Anthropic's compatibility layer does not).
+BATCH_PROVIDERS = {"openai", "google"}
+
 # ── Available Models per Provider ──────────────────────────────────
 # Mix of strong and weak models for game variety
 
@@ -154,6 +159,19 @@ class Player:
     is_active: bool = True   # Still in the game?
     has_won: bool = False    # Correctly guessed themselves?
     private_hints: list[str] = field(default_factory=list)
+    hint_pool: list[str] = field(init=False, repr=False)  # every hint this player can earn
+
+    def __post_init__(self):
+        model_lower = self.model_id.lower()
+        n = len(self.model_id)
+        size = "a flagship/large" if any(k in model_lower for k in ["pro", "opus", "5.2"]) else "a smaller/efficient"
+        self.hint_pool = [
+            f"Your provider is '{self.provider_name}'.",
+            f"Your model name has {n} characters.",
+            f"The first letter of your model ID is '{self.model_id[0]}'.",
+            f"You are {size} model.",
+            f"Your model ID contains the substring '{self.model_id[n // 3 : 2 * n // 3]}'.",
+        ]
 
 
 @dataclass
@@ -165,6 +183,28 @@ class GameState:
     rounds_between_guesses: int = 3  # {N} turns before identity guess opportunity
     max_rounds: int = 20
 
+    players_by_id: dict[int, Player] = field(init=False, repr=False)
+    _active_list: list[Player] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.players_by_id = {p.player_id: p for p in self.players}
+        self._active_list = [p for p in self.players if p.is_active and not p.has_won]
+
     @property
     def active_players(self) -> list[Player]:
-        return [p for p in self.players if p.is_active and not p.has_won]
+        """Live list of players still in the game — copy it before mutating state in a loop."""
+        return self._active_list
+
+    def eliminate(self, player: Player):
+        """Remove a player from the game (russian roulette)."""
+        player.is_active = False
+        self._deactivate(player)
+
+    def mark_won(self, player: Player):
+        """Record a correct self-guess; the player leaves the game as a winner."""
+        player.has_won = True
+        self._deactivate(player)
+
+    def _deactivate(self, player: Player):
+        if player in self._active_list:
+            self._active_list.remove(player)
@@ -1,5 +1,7 @@
 """OpenAI provider configuration for Stille Post."""
 
+import asyncio
+
 from gcp_secrets import SecretsContainer
 from provider import create_provider
 from models import PROVIDER_MODELS
@@ -12,12 +14,21 @@ provider = create_provider(
     models=PROVIDER_MODELS["openai"],
 )
 
+
+async def probe_all(messages: list[dict]) -> list:
+    """Ask every model concurrently; failures are returned, not raised."""
+    return await asyncio.gather(
+        *(provider.agenerate(messages=messages, model=model) for model in provider.config.models),
+        return_exceptions=True,
+    )
+
+
 if __name__ == "__main__":
     # Quick test: ask each model who it is
     messages = [{"role": "user", "content": "Who are you? Answer in one sentence."}]
-    for model in provider.config.models:
-        try:
-            result = provider.generate(messages=messages, model=model)
-            print(f"[{model}]: {result['content'][:120]}")
-        except Exception as e:
-            print(f"[{model}]: ERROR - {e}")
\ No newline at end of file
+    results = asyncio.run(probe_all(messages))
+    for model, result in zip(provider.config.models, results):
+        if isinstance(result, Exception):
+            print(f"[{model}]: ERROR - {result}")
+        else:
+            print(f"[{model}]: {result['content'][:120]}")
\ No newline at end of file
@@ -5,8 +5,105 @@ Since OpenAI, Anthropic, and Google all support the OpenAI chat completions
 format, we use a single provider class. Only base_url and api_key differ.
 """
 
-from openai import OpenAI
-from models import ProviderConfig, GAME_TOOLS, PROVIDER_ENDPOINTS
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI
+from openai.types.chat import ChatCompletion
+from models import ProviderConfig, GAME_TOOLS, PROVIDER_ENDPOINTS, BATCH_PROVIDERS
+
+# The SDK retries 408/409/429/5xx and connection errors with exponential
+# backoff (honouring Retry-After); 4 retries = up to 5 attempts per request.
+MAX_RETRIES = 4
+# In-flight async requests per provider, so concurrent rounds don't trip rate limits
+MAX_CONCURRENCY = 8
+
+
+class ResponseCache:
+    """
+    Exact-match cache of chat completions, keyed on (model, messages, tools).
+
+    Bounded LRU in memory; optionally persisted as JSONL so a rerun of the
+    same game (same seed) is served without any network calls. The file is
+    append-only during a run and compacted to the surviving (non-expired,
+    most recent `max_size`) entries each time it is loaded.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float | None = None, path: str | None = None):
+        self.max_size = max_size
+        self.ttl = ttl            # seconds; None = entries never expire
+        self.path = path
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._load()
+
+    @staticmethod
+    def make_key(model: str, messages: list[dict], tools: list[dict] | None) -> str:
+        canonical = json.dumps(
+            {"m": model, "msgs": messages, "tools": tools},
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: dict):
+        stored_at = time.time()
+        self._insert(key, stored_at, copy.deepcopy(result))
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "ts": stored_at, "result": result}, ensure_ascii=False) + "\n")
+
+    def _insert(self, key: str, stored_at: float, result: dict):
+        self._entries[key] = (stored_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self):
+        """Replay the JSONL file (later lines win, expired lines are skipped), then compact it."""
+        if not os.path.exists(self.path):
+            return
+        now = time.time()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # tolerate a torn last line
+                if self.ttl is not None and now - record["ts"] > self.ttl:
+                    continue
+                self._insert(record["key"], record["ts"], record["result"])
+        self._compact()
+
+    def _compact(self):
+        """Rewrite the file atomically (tmp file + rename) with only the in-memory entries."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for key, (stored_at, result) in self._entries.items():
+                    f.write(json.dumps({"key": key, "ts": stored_at, "result": result}, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # the file just stays uncompacted until the next load
 
 
 class UnifiedLLMProvider:
@@ -15,12 +112,27 @@ class UnifiedLLMProvider:
     via their OpenAI-compatible endpoints.
     """
 
-    def __init__(self, config: ProviderConfig):
+    def __init__(
+        self,
+        config: ProviderConfig,
+        cache: ResponseCache | None = None,
+        http_client: DefaultAsyncHttpxClient | None = None,
+        max_concurrency: int = MAX_CONCURRENCY,
+    ):
         self.config = config
+        self.cache = cache if cache is not None else ResponseCache()
         self.client = OpenAI(
             api_key=config.api_key,
             base_url=config.base_url,
+            max_retries=MAX_RETRIES,
+        )
+        self.aclient = AsyncOpenAI(
+            api_key=config.api_key,
+            base_url=config.base_url,
+            max_retries=MAX_RETRIES,
+            http_client=http_client,  # None -> the SDK creates a private pool
         )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
 
     def generate(
         self,
@@ -39,6 +151,163 @@ class UnifiedLLMProvider:
         Returns:
             dict with 'content' (str) and optionally 'tool_calls' (list).
         """
+        key = ResponseCache.make_key(model, messages, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.client.chat.completions.create(
+            **self._build_kwargs(messages, model, tools)
+        )
+        result = self._parse_response(response)
+        self.cache.put(key, result)
+        return result
+
+    async def agenerate(
+        self,
+        messages: list[dict],
+        model: str,
+        tools: list[dict] | None = None,
+    ) -> dict:
+        """Async variant of `generate`, so several players can be queried concurrently."""
+        key = ResponseCache.make_key(model, messages, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        async with self._semaphore:
+            response = await self.aclient.chat.completions.create(
+                **self._build_kwargs(messages, model, tools)
+            )
+        result = self._parse_response(response)
+        self.cache.put(key, result)
+        return result
+
+    async def agenerate_stream(
+        self,
+        messages: list[dict],
+        model: str,
+        tools: list[dict] | None = None,
+        on_token: Callable[[str], None] | None = None,
+    ) -> dict:
+        """
+        Streaming variant of `agenerate`.
+
+        Text deltas are passed to `on_token` as they arrive; tool call fragments
+        are stitched together and returned once the stream ends, in the same
+        {'content', 'tool_calls'} shape as `generate`.
+        """
+        key = ResponseCache.make_key(model, messages, tools)
+        cached = self.cache.get(key)
+        if cached is not None:
+            if on_token and cached["content"]:
+                on_token(cached["content"])
+            return cached
+
+        async with self._semaphore:
+            stream = await self.aclient.chat.completions.create(
+                **self._build_kwargs(messages, model, tools),
+                stream=True,
+            )
+
+            content_parts = []
+            tool_calls: dict[int, dict] = {}   # stream index -> partial tool call
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                if delta.content:
+                    content_parts.append(delta.content)
+                    if on_token:
+                        on_token(delta.content)
+                for tc in delta.tool_calls or []:
+                    partial = tool_calls.setdefault(tc.index, {"id": None, "name": "", "arguments": ""})
+                    if tc.id:
+                        partial["id"] = tc.id
+                    if tc.function and tc.function.name:
+                        partial["name"] += tc.function.name
+                    if tc.function and tc.function.arguments:
+                        partial["arguments"] += tc.function.arguments
+
+        result = {
+            "content": "".join(content_parts),
+            "tool_calls": [tool_calls[i] for i in sorted(tool_calls)],
+        }
+        self.cache.put(key, result)
+        return result
+
+    async def abatch_generate(
+        self,
+        jobs: list[tuple[list[dict], str]],
+        timeout: float = 600,
+        poll_interval: float = 5,
+    ) -> list:
+        """
+        Run independent, tool-free (messages, model) jobs through the Batch API.
+
+        Batch requests are billed at half price but may take a while, so this
+        raises TimeoutError (after cancelling the batch) if the batch has not
+        finished within `timeout` seconds. Returns one result dict per job, or
+        an Exception for individual jobs the batch could not complete.
+        """
+        if not self.config.supports_batch:
+            raise ValueError(f"Provider '{self.config.name}' does not support the Batch API.")
+
+        keys = [ResponseCache.make_key(model, messages, None) for messages, model in jobs]
+        results = [self.cache.get(key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+
+        lines = [
+            json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": self._build_kwargs(*jobs[i], None),
+            }, ensure_ascii=False)
+            for i in pending
+        ]
+        batch_file = await self.aclient.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await self.aclient.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        deadline = time.monotonic() + timeout
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            if time.monotonic() > deadline:
+                await self.aclient.batches.cancel(batch.id)
+                raise TimeoutError(f"Batch {batch.id} did not finish within {timeout:.0f}s.")
+            await asyncio.sleep(poll_interval)
+            batch = await self.aclient.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'.")
+
+        if batch.output_file_id:
+            output = await self.aclient.files.content(batch.output_file_id)
+            for line in output.text.splitlines():
+                record = json.loads(line)
+                i = int(record["custom_id"])
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    continue
+                results[i] = self._parse_response(ChatCompletion.model_validate(response["body"]))
+                self.cache.put(keys[i], results[i])
+
+        for i in pending:
+            if results[i] is None:
+                results[i] = RuntimeError(f"Batch {batch.id} returned no result for request {i}.")
+        return results
+
+    @staticmethod
+    def _build_kwargs(messages: list[dict], model: str, tools: list[dict] | None) -> dict:
+        """Assemble the chat completions request arguments."""
         kwargs = {
             "model": model,
             "messages": messages,
@@ -46,8 +315,11 @@ class UnifiedLLMProvider:
         if tools:
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
+        return kwargs
 
-        response = self.client.chat.completions.create(**kwargs)
+    @staticmethod
+    def _parse_response(response) -> dict:
+        """Flatten a chat completion into our {'content', 'tool_calls'} dict."""
         choice = response.choices[0]
 
         result = {
@@ -66,7 +338,13 @@ class UnifiedLLMProvider:
         return result
 
 
-def create_provider(name: str, api_key: str, models: list[str]) -> UnifiedLLMProvider:
+def create_provider(
+    name: str,
+    api_key: str,
+    models: list[str],
+    cache: ResponseCache | None = None,
+    http_client: DefaultAsyncHttpxClient | None = None,
+) -> UnifiedLLMProvider:
     """Helper to create a provider by name."""
     if name not in PROVIDER_ENDPOINTS:
         raise ValueError(f"Unknown provider: {name}. Must be one of {list(PROVIDER_ENDPOINTS.keys())}")
@@ -76,5 +354,6 @@ def create_provider(name: str, api_key: str, models: list[str]) -> UnifiedLLMPro
         base_url=PROVIDER_ENDPOINTS[name],
         api_key=api_key,
         models=models,
+        supports_batch=name in BATCH_PROVIDERS,
     )
-    return UnifiedLLMProvider(config)
+    return UnifiedLLMProvider(config, cache=cache, http_client=http_client)
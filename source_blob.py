@@ -0,0 +1,22 @@
+"""
+Game source code, shown verbatim to every player for full transparency.
+
+Built once at import time; the game only references the finished string.
+"""
+
+from pathlib import Path
+
+SOURCE_FILES = ("game.py", "models.py", "provider.py")
+
+_HERE = Path(__file__).resolve().parent
+
+
+def _render(filename: str) -> str:
+    try:
+        code = (_HERE / filename).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return f"\n### {filename}\n(file not found)"
+    return f"\n### {filename}\n```python\n{code}\n```"
+
+
+SOURCE_BLOB: str = "\n".join(["\n## Full Source Code", *(_render(f) for f in SOURCE_FILES)])